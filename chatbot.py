@@ -1,7 +1,27 @@
+import asyncio
+import atexit
+import functools
+import inspect
 import os
+import re
 import sys
+import tempfile
+import threading
 import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from operator import itemgetter
+from typing import Annotated, List, Optional
+
+import aiohttp
+import ijson
+import orjson
 import requests
+from cachetools import Cache, TLRUCache, TTLCache
+from requests.adapters import HTTPAdapter
+import urllib3.exceptions
+from urllib3.util.retry import Retry
 
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
@@ -12,16 +32,127 @@ from langgraph.prebuilt import create_react_agent
 from cdp_langchain.agent_toolkits import CdpToolkit
 from cdp_langchain.utils import CdpAgentkitWrapper
 from cdp_langchain.tools import CdpTool
-from pydantic import BaseModel, Field
+from pydantic import (AfterValidator, AliasPath, BaseModel, ConfigDict, Field,
+                      ValidationError)
 from cdp import Wallet
 
 from twitter_langchain import (TwitterApiWrapper, TwitterToolkit)
 
+# uvloop is an optional, faster drop-in for the asyncio event loop.
+try:
+    import uvloop
+    LOOP_FACTORY = uvloop.new_event_loop
+except ImportError:
+    LOOP_FACTORY = None
+
 MORALIS_API_KEY = os.environ.get("MORALIS_API_KEY")
+HEADERS = {"accept": "application/json", "X-API-Key": MORALIS_API_KEY}
+MISSING_API_KEY_ERROR = (
+    "Error: Moralis API key is missing. "
+    "Please set the MORALIS_API_KEY environment variable.")
+
+# Retry policy shared by the requests session and the aiohttp batch path.
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Share one pooled session so Moralis calls reuse warm TLS connections.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=8,
+                pool_maxsize=32,
+                max_retries=Retry(total=RETRY_TOTAL,
+                                  backoff_factor=RETRY_BACKOFF,
+                                  status_forcelist=RETRY_STATUSES)))
+# (connect, read) timeouts for every Moralis request.
+REQUEST_TIMEOUT = (3, 10)
+ASYNC_REQUEST_TIMEOUT = aiohttp.ClientTimeout(sock_connect=3, sock_read=10)
+# Cap on simultaneous Moralis connections from one aiohttp batch.
+ASYNC_CONNECTION_LIMIT = 16
+
+# Moralis endpoints with their static request shape bound once at import.
+MORALIS_API_URL = "https://deep-index.moralis.io/api/v2.2"
+TOKEN_METADATA_URL = f"{MORALIS_API_URL}/erc20/metadata"
+TOKEN_DETAILS_URL = f"{MORALIS_API_URL}/discovery/token"
+TRENDING_TOKENS_URL = f"{MORALIS_API_URL}/discovery/tokens/trending"
+
+MORALIS_GET = partial(SESSION.get, headers=HEADERS, timeout=REQUEST_TIMEOUT)
+FETCH_METADATA = partial(MORALIS_GET, TOKEN_METADATA_URL)
+FETCH_TOKEN_DETAILS = partial(MORALIS_GET, TOKEN_DETAILS_URL)
+FETCH_TRENDING_TOKENS = partial(MORALIS_GET, TRENDING_TOKENS_URL)
+
+# Transport failures, undecodable and unexpected bodies are all reported to
+# the agent.
+MORALIS_ERRORS = (requests.exceptions.RequestException,
+                  orjson.JSONDecodeError, ValidationError)
+
+# EVM addresses are 0x followed by 40 hex characters; checked before any request.
+_ADDR_RE = re.compile(r"0x[0-9a-fA-F]{40}")
+INVALID_ADDRESS_ERROR = (
+    "Error: invalid address. Expected 0x followed by 40 hex characters.")
+
+# The erc20/metadata endpoint accepts at most this many addresses per request.
+METADATA_BATCH_SIZE = 25
+
+# Trending and PnL lookups always target Base mainnet.
+PARAMS_MAINNET = {"chain": "base"}
 
 # Configure a file to persist the agent's CDP MPC Wallet Data.
 wallet_data_file = "wallet_data.txt"
 
+# Moralis chain name for the agent's network, resolved in initialize_agent.
+CHAIN = "base sepolia"
+
+# Load the agent's system prompt once; it is sent with every LLM request.
+system_prompt_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "prompts", "system.txt")
+with open(system_prompt_file) as f:
+    SYSTEM_PROMPT = sys.intern(f.read().strip())
+
+# Configure a file to persist Moralis token metadata between runs.
+meta_cache_file = "moralis_meta_cache.json"
+
+# Bump when the cached metadata format changes so stale snapshots are dropped.
+META_CACHE_VERSION = 2
+META_CACHE_TTL = 3600
+
+
+class _MetaCache(TLRUCache):
+    """
+    Token metadata cache that remembers when each entry was fetched.
+
+    Entries restored from disk keep their wall-clock fetch time, so they
+    expire on their original schedule instead of getting a fresh TTL.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize, ttu=self._expires, timer=time.time)
+        self.ttl = ttl
+        self.fetched_at = {}
+
+    def _expires(self, key, value, now):
+        return self.fetched_at[key] + self.ttl
+
+    def __setitem__(self, key, value):
+        self.restore(key, value, self.timer())
+
+    def restore(self, key, value, fetched_at: float) -> None:
+        """Insert an entry that was fetched at the given wall-clock time."""
+        self.fetched_at[key] = fetched_at
+        super().__setitem__(key, value)
+        # Expiry and eviction bypass __delitem__, so drop the fetch times of
+        # entries that are gone once they pile up.
+        if len(self.fetched_at) > 2 * self.maxsize:
+            for stale in self.fetched_at.keys() - self.keys():
+                del self.fetched_at[stale]
+
+
+# Token metadata virtually never changes, prices move on the minute scale.
+_META_CACHE = _MetaCache(maxsize=4096, ttl=META_CACHE_TTL)
+_PRICE_CACHE = TTLCache(maxsize=4096, ttl=300)
+_CACHE_LOCK = threading.Lock()
+
 # Existing Multi-Token Deployment Prompt
 DEPLOY_MULTITOKEN_PROMPT = """
 This tool deploys a new multi-token contract with a specified base URI for token metadata.
@@ -34,35 +165,89 @@ TOKEN_METADATA_PROMPT = """
 Fetch metadata for an ERC-20 token using the Moralis API. 
 Provides comprehensive information about a specific token, 
 including name, symbol, decimals, total supply, and verification status.
+Returns a JSON object with keys: name, symbol, decimals, total_supply, address,
+verified_contract, logo.
 """
 
 TOKEN_DETAILS_PROMPT = """
 Fetch comprehensive details about a specific ERC-20 token on the Base blockchain.
 Provides in-depth information including price, market cap, security score, 
 holders change, volume changes, and price performance.
+Returns a JSON object with keys: token_name, token_symbol, price_usd, market_cap,
+security_score, token_age_in_days, on_chain_strength_index, holders_change_1d,
+volume_change_usd_1d, price_percent_change_usd_1M, token_logo.
 """
 
 TOKEN_PAIRS_PROMPT = """
 Retrieve trading pairs for a specific ERC-20 token on the Base blockchain.
 Returns detailed information about token trading pairs, including liquidity, 
 price, and exchange details.
+Output is one pair per line with "|"-separated columns, named in the header line:
+pair|price_usd|price_change_24h_pct|liquidity_usd|exchange_address|base_token|base_symbol|quote_token|quote_symbol
 """
 
 TRENDING_TOKENS_PROMPT = """
 Discover trending tokens on the Base blockchain with optional 
 filtering by security score and market capitalization.
 Provides comprehensive information about top-performing tokens using the Moralis API.
+Output is one token per line with "|"-separated columns, named in the header line:
+name|symbol|token_address|price_usd|market_cap|security_score|logo
+"""
+
+TOKEN_METADATA_BATCH_PROMPT = """
+Fetch metadata for several ERC-20 tokens in one call using the Moralis API.
+Use this instead of calling get_token_metadata repeatedly for a basket of tokens.
+Each token's metadata is a JSON object with the same keys as get_token_metadata.
+"""
+
+TOKEN_DETAILS_BATCH_PROMPT = """
+Fetch comprehensive details for several ERC-20 tokens on the Base blockchain in one call.
+Use this instead of calling get_token_details repeatedly when evaluating a basket of tokens,
+for example every token returned by get_trending_tokens.
+Each token's details are a JSON object with the same keys as get_token_details.
+"""
+
+TRENDING_TOKENS_ENRICHED_PROMPT = """
+Discover trending tokens on the Base blockchain together with the full details
+and trading pairs of every trending token, in a single call.
+Prefer this over get_trending_tokens followed by per-token get_token_details
+and get_token_pairs calls when evaluating tokens to invest in.
+Each token starts with its trending row (columns as in get_trending_tokens),
+followed by a "Details:" line with the get_token_details JSON object and then its
+trading pairs, listed one per line with "|"-separated columns as in get_token_pairs.
 """
 
 WALLET_PNL_PROMPT = """
 Calculate and retrieve Profit and Loss (PnL) information for the agent's wallet assets.
 Provides detailed insights into token investments, realized profits, and average buy prices.
+Output is one token per line with "|"-separated columns, named in the header line:
+name|symbol|total_usd_invested|realized_profit_usd|avg_buy_price_usd|total_tokens_bought|logo
 """
 
 
 # Input Models
+# Tool inputs are parsed from LLM output on every call: reject unknown keys,
+# strip stray whitespace and keep the parsed objects immutable.
+_INPUT_CONFIG = ConfigDict(frozen=True,
+                           str_strip_whitespace=True,
+                           extra="forbid")
+
+
+def _check_token_address(value: str) -> str:
+    """Reject malformed addresses before they cost a Moralis round-trip."""
+    if not _ADDR_RE.fullmatch(value):
+        raise ValueError(f"Invalid token address {value!r}: expected 0x "
+                         "followed by 40 hex characters")
+    return value
+
+
+TokenAddress = Annotated[str, AfterValidator(_check_token_address)]
+
+
 class DeployMultiTokenInput(BaseModel):
     """Input argument schema for deploy multi-token contract action."""
+    model_config = _INPUT_CONFIG
+
     base_uri: str = Field(
         ...,
         description=
@@ -71,30 +256,56 @@ class DeployMultiTokenInput(BaseModel):
 
 
 class TokenMetadataInput(BaseModel):
-    token_address: str = Field(
+    model_config = _INPUT_CONFIG
+
+    token_address: TokenAddress = Field(
         ...,
         description="Contract address of the ERC-20 token",
         example="0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913")
 
 
 class TokenDetailsInput(BaseModel):
+    model_config = _INPUT_CONFIG
 
-    token_address: str = Field(
+    token_address: TokenAddress = Field(
         ...,
         description=
         "The contract address of the ERC-20 token to retrieve details for",
         example="0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913")
 
 
+class TokenMetadataBatchInput(BaseModel):
+    """Input argument schema for get token metadata batch action."""
+    model_config = _INPUT_CONFIG
+
+    token_addresses: List[TokenAddress] = Field(
+        ...,
+        description="Contract addresses of the ERC-20 tokens",
+        example=["0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"])
+
+
+class TokenDetailsBatchInput(BaseModel):
+    """Input argument schema for get token details batch action."""
+    model_config = _INPUT_CONFIG
+
+    token_addresses: List[TokenAddress] = Field(
+        ...,
+        description=
+        "The contract addresses of the ERC-20 tokens to retrieve details for",
+        example=["0x833589fCD6eDb6E08f4c7C32D4f71b54bdA02913"])
+
+
 class WalletNftsInput(BaseModel):
     """Input schema for get wallet NFTs action."""
+    model_config = _INPUT_CONFIG
 
     # No input parameters needed as this uses the agent's current wallet
-    pass
 
 
 class TokenPairsInput(BaseModel):
-    token_address: str = Field(
+    model_config = _INPUT_CONFIG
+
+    token_address: TokenAddress = Field(
         ...,
         description=
         "Contract address of the ERC-20 token to find trading pairs",
@@ -103,6 +314,8 @@ class TokenPairsInput(BaseModel):
 
 class TrendingTokensInput(BaseModel):
     """Input argument schema for fetching trending tokens."""
+    model_config = _INPUT_CONFIG
+
     security_score: int = Field(
         default=80,
         description="Minimum security score for tokens",
@@ -115,6 +328,7 @@ class TrendingTokensInput(BaseModel):
 
 class WalletPnlInput(BaseModel):
     """Input argument schema for get wallet PnL action."""
+    model_config = _INPUT_CONFIG
 
     chain: str = Field(
         default="base",
@@ -123,6 +337,7 @@ class WalletPnlInput(BaseModel):
 
 class GenerateArtInput(BaseModel):
     """Input argument schema for generate art action."""
+    model_config = _INPUT_CONFIG
 
     prompt: str = Field(
         ..., 
@@ -131,6 +346,195 @@ class GenerateArtInput(BaseModel):
     )
 
 
+# Response Models
+class TokenMetadataResult(BaseModel):
+    """Token metadata returned by the get_token_metadata tool."""
+    name: Optional[str] = None
+    symbol: Optional[str] = None
+    decimals: Optional[int] = None
+    total_supply: Optional[str] = Field(
+        default=None, validation_alias="total_supply_formatted")
+    address: Optional[str] = None
+    verified_contract: Optional[bool] = None
+    logo: Optional[str] = None
+
+
+class TokenDetailsResult(BaseModel):
+    """Token details returned by the get_token_details tools."""
+    token_name: Optional[str] = None
+    token_symbol: Optional[str] = None
+    price_usd: Optional[float] = None
+    market_cap: Optional[float] = None
+    security_score: Optional[float] = None
+    token_age_in_days: Optional[float] = None
+    on_chain_strength_index: Optional[float] = None
+    holders_change_1d: Optional[float] = Field(
+        default=None, validation_alias=AliasPath("holders_change", "1d"))
+    volume_change_usd_1d: Optional[float] = Field(
+        default=None, validation_alias=AliasPath("volume_change_usd", "1d"))
+    price_percent_change_usd_1M: Optional[float] = Field(
+        default=None,
+        validation_alias=AliasPath("price_percent_change_usd", "1M"))
+    token_logo: Optional[str] = None
+
+
+def _dump_result(model: type[BaseModel], data: dict) -> str:
+    """Validate a Moralis payload against a response model and encode it."""
+    return orjson.dumps(model.model_validate(data).model_dump()).decode()
+
+
+# Output templates, compiled once and filled per row. List results are
+# emitted as one "|"-delimited row per entry under a single column header,
+# which the tool prompts describe to the model once.
+_PAIR_HEADER = ("pair|price_usd|price_change_24h_pct|liquidity_usd|"
+                "exchange_address|base_token|base_symbol|quote_token|"
+                "quote_symbol\n")
+_PAIR_TEMPLATE = "{}|{}|{}|{}|{}|{}|{}|{}|{}\n".format
+_PAIR_FIELDS = itemgetter("pair_label", "usd_price",
+                          "usd_price_24hr_percent_change", "liquidity_usd",
+                          "exchange_address")
+_PAIR_TOKEN_FIELDS = itemgetter("token_name", "token_symbol")
+
+_TRENDING_TOKEN_HEADER = ("name|symbol|token_address|price_usd|market_cap|"
+                          "security_score|logo\n")
+_TRENDING_TOKEN_TEMPLATE = "{}|{}|{}|{}|{}|{}|{}\n".format
+_TRENDING_TOKEN_FIELDS = itemgetter("token_name", "token_symbol",
+                                    "token_address", "price_usd",
+                                    "market_cap", "security_score",
+                                    "token_logo")
+
+_PNL_HEADER = ("name|symbol|total_usd_invested|realized_profit_usd|"
+               "avg_buy_price_usd|total_tokens_bought|logo\n")
+_PNL_TEMPLATE = "{}|{}|{}|{}|{}|{}|{}\n".format
+_PNL_FIELDS = itemgetter("name", "symbol", "total_usd_invested",
+                         "realized_profit_usd", "avg_buy_price_usd",
+                         "total_tokens_bought", "logo")
+
+# Token names and symbols are attacker-chosen: keep them from forging extra
+# columns or rows in output the agent trades on.
+_CELL_ESCAPES = str.maketrans({"|": "/", "\r": " ", "\n": " "})
+
+
+def _clean(value):
+    """Strip row and column delimiters from a string field."""
+    if isinstance(value, str):
+        return value.translate(_CELL_ESCAPES)
+    return value
+
+
+# Cap on how much of a wallet's NFT holdings is echoed back to the agent.
+NFT_SAMPLE_SIZE = 20
+NFT_TOP_COLLECTIONS = 5
+
+
+# Moralis response caching
+def _cache_get(cache: Cache, key: tuple):
+    with _CACHE_LOCK:
+        return cache.get(key)
+
+
+def _cache_set(cache: Cache, key: tuple, value) -> None:
+    # Error messages are returned as strings too; never cache those.
+    if isinstance(value, str) and value.startswith("Error"):
+        return
+    with _CACHE_LOCK:
+        cache[key] = value
+
+
+def _cached(cache: Cache):
+    """Cache a Moralis fetcher's formatted output keyed on its arguments."""
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # CdpTool passes arguments by keyword, so normalise before keying.
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (func.__name__, CHAIN, *bound.arguments.values())
+            result = _cache_get(cache, key)
+            if result is None:
+                result = func(*args, **kwargs)
+                _cache_set(cache, key, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _split_cached(cache: Cache, func_name: str,
+                  token_addresses: List[str]) -> tuple[dict, list]:
+    """
+    Resolve what a batch tool can answer without calling Moralis.
+
+    Malformed addresses get INVALID_ADDRESS_ERROR and cached ones the entry
+    stored by the single-token tool func_name.
+
+    Returns:
+        tuple[dict, list]: The results so far and the de-duplicated
+        addresses that still have to be fetched.
+    """
+    results = {}
+    for address in token_addresses:
+        if not _ADDR_RE.fullmatch(address):
+            results[address] = INVALID_ADDRESS_ERROR
+            continue
+        cached = _cache_get(cache, (func_name, CHAIN, address))
+        if cached is not None:
+            results[address] = cached
+
+    missing = [a for a in dict.fromkeys(token_addresses) if a not in results]
+    return results, missing
+
+
+def _join_batch(token_addresses: List[str], results: dict) -> str:
+    """Join per-token batch results in the order the addresses were given."""
+    return "\n".join(f"Token {address}:\n{results[address]}"
+                     for address in token_addresses)
+
+
+def _load_meta_cache() -> None:
+    """Reload persisted token metadata entries that are still fresh."""
+    if not os.path.exists(meta_cache_file):
+        return
+    try:
+        with open(meta_cache_file, "rb") as f:
+            snapshot = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return
+    if snapshot.get("version") != META_CACHE_VERSION:
+        return
+    now = time.time()
+    for key, fetched_at, value in snapshot.get("entries", []):
+        if now - fetched_at < META_CACHE_TTL:
+            _META_CACHE.restore(tuple(key), value, fetched_at)
+
+
+def _save_meta_cache() -> None:
+    """Persist token metadata so the next run starts warm."""
+    with _CACHE_LOCK:
+        _META_CACHE.expire()
+        entries = [[list(key), _META_CACHE.fetched_at[key], value]
+                   for key, value in _META_CACHE.items()]
+    if not entries:
+        return
+    try:
+        with open(meta_cache_file, "wb") as f:
+            f.write(
+                orjson.dumps({
+                    "version": META_CACHE_VERSION,
+                    "entries": entries
+                }))
+    except OSError:
+        pass
+
+
+_load_meta_cache()
+atexit.register(_save_meta_cache)
+
+
 # Function definitions
 def deploy_multi_token(wallet: Wallet, base_uri: str) -> str:
     """Deploy a new multi-token contract with the specified base URI."""
@@ -143,6 +547,7 @@ def deploy_multi_token(wallet: Wallet, base_uri: str) -> str:
     return f"Successfully deployed multi-token contract at address:{result.contract_address}"
 
 
+@_cached(_META_CACHE)
 def get_token_metadata(token_address: str) -> str:
     """
     Fetch metadata for an ERC-20 token using the Moralis API.
@@ -152,44 +557,98 @@ def get_token_metadata(token_address: str) -> str:
         token_address (str): The address of the ERC-20 token
 
     Returns:
-        str: A message with the token metadata or an error message if unsuccessful
+        str: The token metadata as a JSON object or an error message if unsuccessful
     """
+    if not _ADDR_RE.fullmatch(token_address):
+        return INVALID_ADDRESS_ERROR
+
     # Read the Moralis API key from the environment
     if not MORALIS_API_KEY:
-        return "Error: Moralis API key is missing. Please set the MORALIS_API_KEY environment variable."
-
-    # Determine the network dynamically based on the agent's current network ID
-    is_mainnet = Wallet.network_id in ["base", "base-mainnet"]
-    chain = "base" if is_mainnet else "base sepolia"
-
-    # API endpoint and headers
-    url = "https://deep-index.moralis.io/api/v2.2/erc20/metadata"
-    headers = {"accept": "application/json", "X-API-Key": MORALIS_API_KEY}
-    params = {"chain": chain, "addresses[0]": token_address}
+        return MISSING_API_KEY_ERROR
 
     # Fetch token metadata
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = FETCH_METADATA(params={
+            "chain": CHAIN,
+            "addresses[0]": token_address
+        })
         response.raise_for_status()
-        metadata = response.json()
+        metadata = orjson.loads(response.content)
 
         if metadata:
-            token_data = metadata[0]
-            return (
-                f"Token Name: {token_data.get('name')}\n"
-                f"Symbol: {token_data.get('symbol')}\n"
-                f"Decimals: {token_data.get('decimals')}\n"
-                f"Total Supply: {token_data.get('total_supply_formatted')}\n"
-                f"Contract Address: {token_data.get('address')}\n"
-                f"Verified: {token_data.get('verified_contract')}\n"
-                f"Logo URL: {token_data.get('logo')}\n")
+            return _dump_result(TokenMetadataResult, metadata[0])
         else:
             return "No metadata found for the provided token address."
 
-    except requests.exceptions.RequestException as e:
+    except MORALIS_ERRORS as e:
         return f"Error fetching token metadata: {str(e)}"
 
 
+def _fetch_token_metadata_chunk(token_addresses: List[str]) -> dict:
+    """Fetch metadata for up to METADATA_BATCH_SIZE addresses in one request."""
+    params = {"chain": CHAIN}
+    for i, address in enumerate(token_addresses):
+        params[f"addresses[{i}]"] = address
+
+    try:
+        response = FETCH_METADATA(params=params)
+        response.raise_for_status()
+        by_address = {(token_data.get("address") or "").lower(): token_data
+                      for token_data in orjson.loads(response.content)}
+
+        results = {}
+        for address in token_addresses:
+            token_data = by_address.get(address.lower())
+            if token_data:
+                results[address] = _dump_result(TokenMetadataResult,
+                                                token_data)
+            else:
+                results[address] = (
+                    "No metadata found for the provided token address.")
+        return results
+
+    except MORALIS_ERRORS as e:
+        error = f"Error fetching token metadata: {str(e)}"
+        return dict.fromkeys(token_addresses, error)
+
+
+def get_token_metadata_batch(token_addresses: List[str]) -> str:
+    """
+    Fetch metadata for several ERC-20 tokens using the Moralis API.
+
+    Addresses are sent METADATA_BATCH_SIZE at a time through the endpoint's
+    addresses[] array parameter, so N tokens cost ceil(N / 25) requests.
+    Moralis bills this endpoint per request, which is what makes batching pay.
+
+    Args:
+        token_addresses (List[str]): The addresses of the ERC-20 tokens.
+
+    Returns:
+        str: The metadata of each token or an error message per token.
+    """
+    if not MORALIS_API_KEY:
+        return MISSING_API_KEY_ERROR
+
+    if not token_addresses:
+        return "No token addresses provided."
+
+    results, missing = _split_cached(_META_CACHE, "get_token_metadata",
+                                     token_addresses)
+    chunks = [
+        missing[i:i + METADATA_BATCH_SIZE]
+        for i in range(0, len(missing), METADATA_BATCH_SIZE)
+    ]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for fetched in executor.map(_fetch_token_metadata_chunk, chunks):
+            for address, result in fetched.items():
+                _cache_set(_META_CACHE,
+                           ("get_token_metadata", CHAIN, address), result)
+                results[address] = result
+
+    return _join_batch(token_addresses, results)
+
+
+@_cached(_PRICE_CACHE)
 def get_token_details(token_address: str) -> str:
     """
     Fetch detailed information about a specific ERC-20 token on the Base blockchain using MOralis API
@@ -201,71 +660,186 @@ def get_token_details(token_address: str) -> str:
     Returns:
         str: Information about the token or an error message if unsuccessful.
     """
-    # Determine the network dynamically based on the agent's current network ID
-    is_mainnet = Wallet.network_id in ["base", "base-mainnet"]
-    chain = "base" if is_mainnet else "base sepolia"
-
-    # API endpoint and headers
-    url = "https://deep-index.moralis.io/api/v2.2/discovery/token"
-    headers = {"accept": "application/json", "X-API-Key": MORALIS_API_KEY}
-    params = {"chain": chain, "token_address": token_address}
+    if not _ADDR_RE.fullmatch(token_address):
+        return INVALID_ADDRESS_ERROR
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = FETCH_TOKEN_DETAILS(params={
+            "chain": CHAIN,
+            "token_address": token_address
+        })
         response.raise_for_status()
-        token_data = response.json()
+        return _dump_result(TokenDetailsResult,
+                            orjson.loads(response.content))
 
-        # Format the output
-        token_info = (
-            f"Token Name: {token_data.get('token_name')}\n"
-            f"Symbol: {token_data.get('token_symbol')}\n"
-            f"Price (USD): {token_data.get('price_usd')}\n"
-            f"Market Cap: {token_data.get('market_cap')}\n"
-            f"Security Score: {token_data.get('security_score')}\n"
-            f"Token Age (days): {token_data.get('token_age_in_days')}\n"
-            f"On-Chain Strength Index: {token_data.get('on_chain_strength_index')}\n"
-            f"1-Day Holders Change: {token_data['holders_change'].get('1d')}\n"
-            f"1-Day Volume Change (USD): {token_data['volume_change_usd'].get('1d')}\n"
-            f"1-Month Price Change (%): {token_data['price_percent_change_usd'].get('1M')}\n"
-            f"Logo: {token_data.get('token_logo')}\n")
-        return token_info
-
-    except requests.exceptions.RequestException as e:
+    except MORALIS_ERRORS as e:
         return f"Error fetching token details: {str(e)}"
 
 
+async def get_token_details_async(session: aiohttp.ClientSession,
+                                  token_address: str) -> str:
+    """
+    Asynchronously fetch detailed information about an ERC-20 token.
+
+    Args:
+        session (aiohttp.ClientSession): The session to issue the request on.
+        token_address (str): The address of the ERC-20 token.
+
+    Returns:
+        str: Information about the token or an error message if unsuccessful.
+    """
+    params = {"chain": CHAIN, "token_address": token_address}
+
+    try:
+        # Retry rate limits and server errors like the requests session does.
+        for attempt in range(RETRY_TOTAL + 1):
+            async with session.get(TOKEN_DETAILS_URL,
+                                   params=params) as response:
+                if (response.status in RETRY_STATUSES
+                        and attempt < RETRY_TOTAL):
+                    await asyncio.sleep(RETRY_BACKOFF * 2**attempt)
+                    continue
+                response.raise_for_status()
+                return _dump_result(TokenDetailsResult,
+                                    orjson.loads(await response.read()))
+
+    except (aiohttp.ClientError, orjson.JSONDecodeError,
+            ValidationError) as e:
+        return f"Error fetching token details: {str(e)}"
+
+
+async def _gather_token_details(token_addresses: List[str]) -> list:
+    """Fetch details for all addresses concurrently over a shared session."""
+    # The connector queues requests beyond the limit instead of opening a
+    # socket per address, so a large basket cannot trip Moralis rate limits.
+    connector = aiohttp.TCPConnector(limit=ASYNC_CONNECTION_LIMIT)
+    async with aiohttp.ClientSession(headers=HEADERS,
+                                     timeout=ASYNC_REQUEST_TIMEOUT,
+                                     connector=connector) as session:
+        return await asyncio.gather(
+            *(get_token_details_async(session, address)
+              for address in token_addresses),
+            return_exceptions=True)
+
+
+def get_token_details_batch(token_addresses: List[str]) -> str:
+    """
+    Fetch detailed information about several ERC-20 tokens concurrently.
+
+    The requests are issued together with asyncio.gather so a basket of N
+    tokens costs roughly one round-trip instead of N.
+
+    Args:
+        token_addresses (List[str]): The addresses of the ERC-20 tokens.
+
+    Returns:
+        str: Information about each token or an error message per token.
+    """
+    if not MORALIS_API_KEY:
+        return MISSING_API_KEY_ERROR
+
+    if not token_addresses:
+        return "No token addresses provided."
+
+    results, missing = _split_cached(_PRICE_CACHE, "get_token_details",
+                                     token_addresses)
+    if missing:
+        fetched = asyncio.run(_gather_token_details(missing),
+                              loop_factory=LOOP_FACTORY)
+        for address, result in zip(missing, fetched):
+            if isinstance(result, BaseException):
+                result = f"Error fetching token details: {str(result)}"
+            _cache_set(_PRICE_CACHE, ("get_token_details", CHAIN, address),
+                       result)
+            results[address] = result
+
+    return _join_batch(token_addresses, results)
+
+
 def get_wallet_nfts(wallet: Wallet) -> str:
     """
-    Fetch the raw response of NFTs held by the agent's wallet on the Base blockchain.
+    Summarize the NFTs held by the agent's wallet on the Base blockchain.
     Automatically determines if the network is mainnet or testnet.
 
+    The Moralis response is stream-parsed so only a running count per
+    collection and a small sample are kept in memory and returned. Only the
+    first page of results is read; the summary says so when more exist.
+
     Args:
         wallet (Wallet): The wallet to retrieve NFTs for.
 
     Returns:
-        str: Raw JSON response of NFTs or an error message if unsuccessful.
+        str: A summary of the wallet's NFTs or an error message if unsuccessful.
     """
     # Get the agent's wallet address
     wallet_address = wallet.default_address.address_id
 
-    # Determine the network dynamically based on the agent's current network ID
-    is_mainnet = Wallet.network_id in ["base", "base-mainnet"]
-    chain = "base" if is_mainnet else "base sepolia"
+    # API endpoint and parameters
+    url = f"{MORALIS_API_URL}/{wallet_address}/nft"
+    params = {"chain": CHAIN, "format": "decimal", "media_items": "false"}
 
-    # API endpoint and headers
-    url = f"https://deep-index.moralis.io/api/v2.2/{wallet_address}/nft"
-    headers = {"accept": "application/json", "X-API-Key": MORALIS_API_KEY}
-    params = {"chain": chain, "format": "decimal", "media_items": "false"}
+    collections = Counter()
+    collection_names = {}
+    sample = []
+    cursor = None
 
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        return response.text  # Return the raw JSON response as text
-
-    except requests.exceptions.RequestException as e:
+        with MORALIS_GET(url, params=params, stream=True) as response:
+            response.raise_for_status()
+            # Let urllib3 undo any gzip/deflate encoding while streaming.
+            response.raw.decode_content = True
+
+            # Walk the raw parse events so the pagination cursor is seen
+            # wherever it appears, building one NFT object at a time.
+            builder = None
+            for prefix, event, value in ijson.parse(response.raw):
+                if prefix == "cursor":
+                    cursor = value
+                elif prefix == "result.item" and event == "start_map":
+                    builder = ijson.ObjectBuilder()
+                if builder is None:
+                    continue
+                builder.event(event, value)
+                if prefix != "result.item" or event != "end_map":
+                    continue
+
+                nft, builder = builder.value, None
+                address = nft.get("token_address")
+                collections[address] += 1
+                name = _clean(nft.get("name"))
+                collection_names.setdefault(address, name)
+                if len(sample) < NFT_SAMPLE_SIZE:
+                    sample.append(f"{name} #{_clean(nft.get('token_id'))} "
+                                  f"({address})")
+
+    # Reading response.raw bypasses requests' exception wrapping, so
+    # mid-stream connection failures surface as raw urllib3 errors.
+    except (*MORALIS_ERRORS, urllib3.exceptions.HTTPError,
+            ijson.JSONError) as e:
         return f"Error fetching wallet NFTs: {str(e)}"
 
-
+    total = sum(collections.values())
+    if not total:
+        return f"No NFTs found for wallet {wallet_address}."
+
+    if cursor:
+        holdings = (f"Wallet {wallet_address} holds at least {total} NFTs "
+                    f"across {len(collections)} collections (first page of "
+                    "results only; more NFTs are available).\n")
+    else:
+        holdings = (f"Wallet {wallet_address} holds {total} NFTs "
+                    f"across {len(collections)} collections.\n")
+    parts = [holdings, "Top Collections:\n"]
+    append = parts.append
+    for address, count in collections.most_common(NFT_TOP_COLLECTIONS):
+        append(f"{collection_names[address]} ({address}): {count}\n")
+    append(f"Sample NFTs (up to {NFT_SAMPLE_SIZE}):\n")
+    for entry in sample:
+        append(f"{entry}\n")
+    return "".join(parts)
+
+
+@_cached(_PRICE_CACHE)
 def get_token_pairs(token_address: str) -> str:
     """
             Fetch trading pairs for a specific ERC-20 token on the Base blockchain.
@@ -277,40 +851,59 @@ def get_token_pairs(token_address: str) -> str:
             Returns:
                 str: Information about trading pairs or an error message if unsuccessful.
             """
-    # Determine the network dynamically based on the agent's current network ID
-    is_mainnet = Wallet.network_id in ["base", "base-mainnet"]
-    chain = "base" if is_mainnet else "base sepolia"
+    if not _ADDR_RE.fullmatch(token_address):
+        return INVALID_ADDRESS_ERROR
 
-    # API endpoint and headers
-    url = f"https://deep-index.moralis.io/api/v2.2/erc20/{token_address}/pairs"
-    headers = {"accept": "application/json", "X-API-Key": MORALIS_API_KEY}
-    params = {"chain": chain}
+    # API endpoint and parameters
+    url = f"{MORALIS_API_URL}/erc20/{token_address}/pairs"
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = MORALIS_GET(url, params={"chain": CHAIN})
         response.raise_for_status()
-        pairs = response.json().get("pairs", [])
+        pairs = orjson.loads(response.content).get("pairs", [])
 
         # Format the output
         if pairs:
-            pairs_info = "\n".join([
-                f"Pair: {pair['pair_label']}\n"
-                f"Price (USD): {pair['usd_price']}\n"
-                f"24hr Price Change (%): {pair['usd_price_24hr_percent_change']}\n"
-                f"Liquidity (USD): {pair['liquidity_usd']}\n"
-                f"Exchange Address: {pair['exchange_address']}\n"
-                f"Base Token: {pair['pair'][0]['token_name']} ({pair['pair'][0]['token_symbol']})\n"
-                f"Quote Token: {pair['pair'][1]['token_name']} ({pair['pair'][1]['token_symbol']})\n"
-                for pair in pairs
-            ])
-            return f"Trading pairs for token {token_address}:\n{pairs_info}"
+            parts = [
+                f"Trading pairs for token {token_address}:\n", _PAIR_HEADER
+            ]
+            append = parts.append
+            for pair in pairs:
+                base, quote = pair["pair"][:2]
+                append(
+                    _PAIR_TEMPLATE(*map(
+                        _clean,
+                        _PAIR_FIELDS(pair) + _PAIR_TOKEN_FIELDS(base) +
+                        _PAIR_TOKEN_FIELDS(quote))))
+            return "".join(parts)
         else:
             return f"No trading pairs found for token {token_address}."
 
-    except requests.exceptions.RequestException as e:
+    except MORALIS_ERRORS as e:
         return f"Error fetching token pairs: {str(e)}"
 
 
+def _fetch_trending_tokens(security_score=80, min_market_cap=100000) -> list:
+    """Fetch the raw list of trending tokens, shared by both trending tools."""
+    # Trending tokens are always queried on mainnet, so CHAIN is not keyed.
+    key = ("_fetch_trending_tokens", security_score, min_market_cap)
+    tokens = _cache_get(_PRICE_CACHE, key)
+    if tokens is not None:
+        return tokens
+
+    params = {
+        **PARAMS_MAINNET,
+        "security_score": security_score,
+        "min_market_cap": min_market_cap
+    }
+
+    response = FETCH_TRENDING_TOKENS(params=params)
+    response.raise_for_status()
+    tokens = orjson.loads(response.content)
+    _cache_set(_PRICE_CACHE, key, tokens)
+    return tokens
+
+
 def get_trending_tokens(security_score=80, min_market_cap=100000) -> str:
     """
         Fetch trending tokens with a minimum security score and market cap.
@@ -322,32 +915,64 @@ def get_trending_tokens(security_score=80, min_market_cap=100000) -> str:
         Returns:
             str: Trending token information or an error message
         """
-    url = "https://deep-index.moralis.io/api/v2.2/discovery/tokens/trending"
-    headers = {"accept": "application/json", "X-API-Key": MORALIS_API_KEY}
-    params = {
-        "chain": "base",
-        "security_score": security_score,
-        "min_market_cap": min_market_cap
-    }
-
     try:
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        tokens = response.json()
+        tokens = _fetch_trending_tokens(security_score, min_market_cap)
 
         # Format the output
-        token_info = "\n".join([
-            f"Token Name: {token['token_name']} ({token['token_symbol']})\n"
-            f"Price (USD): {token['price_usd']}\n"
-            f"Market Cap: {token['market_cap']}\n"
-            f"Security Score: {token['security_score']}\n"
-            f"Logo: {token['token_logo']}\n" for token in tokens
-        ])
-        return f"Trending Tokens:\n{token_info}"
-
-    except requests.exceptions.RequestException as e:
+        parts = ["Trending Tokens:\n", _TRENDING_TOKEN_HEADER]
+        append = parts.append
+        for token in tokens:
+            append(
+                _TRENDING_TOKEN_TEMPLATE(
+                    *map(_clean, _TRENDING_TOKEN_FIELDS(token))))
+        return "".join(parts)
+
+    except MORALIS_ERRORS as e:
+        return f"Error fetching trending tokens: {str(e)}"
+
+
+def get_trending_tokens_enriched(security_score=80,
+                                 min_market_cap=100000) -> str:
+    """
+    Fetch trending tokens along with the details and trading pairs of each.
+
+    The per-token lookups run concurrently on a thread pool over the shared
+    Moralis session, replacing one agent tool call per token with a single one.
+
+    Args:
+        security_score (int): Minimum security score for tokens
+        min_market_cap (int): Minimum market cap for tokens
+
+    Returns:
+        str: Enriched trending token information or an error message
+    """
+    try:
+        tokens = _fetch_trending_tokens(security_score, min_market_cap)
+    except MORALIS_ERRORS as e:
         return f"Error fetching trending tokens: {str(e)}"
 
+    if not tokens:
+        return "No trending tokens found."
+
+    addresses = [token["token_address"] for token in tokens]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        details = executor.map(get_token_details, addresses)
+        pairs = executor.map(get_token_pairs, addresses)
+
+        # Lead each token with its trending row so the details and pairs
+        # stay attributable even when one of the lookups failed.
+        parts = ["Trending Tokens:\n", _TRENDING_TOKEN_HEADER]
+        append = parts.append
+        for token, token_details, token_pairs in zip(tokens, details, pairs):
+            append("\n")
+            append(
+                _TRENDING_TOKEN_TEMPLATE(
+                    *map(_clean, _TRENDING_TOKEN_FIELDS(token))))
+            append(f"Details: {token_details}\n")
+            append(f"{token_pairs.rstrip()}\n")
+
+    return "".join(parts)
+
 
 def get_wallet_pnl(wallet: Wallet) -> str:
     """
@@ -362,45 +987,54 @@ def get_wallet_pnl(wallet: Wallet) -> str:
     # Get the agent's wallet address
     address_id = wallet.default_address.address_id
 
-    url = f"https://deep-index.moralis.io/api/v2.2/wallets/{address_id}/profitability"
-    headers = {"accept": "application/json", "X-API-Key": MORALIS_API_KEY}
-    params = {"chain": "base"}
+    url = f"{MORALIS_API_URL}/wallets/{address_id}/profitability"
 
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = MORALIS_GET(url, params=PARAMS_MAINNET)
         response.raise_for_status()
-        pnl_data = response.json().get("result", [])
+        pnl_data = orjson.loads(response.content).get("result", [])
 
         # Format the output
         if pnl_data:
-            pnl_info = "\n".join([
-                f"Token: {entry['name']} ({entry['symbol']})\n"
-                f"Total Invested: ${entry['total_usd_invested']}\n"
-                f"Realized Profit: ${entry['realized_profit_usd']}\n"
-                f"Avg Buy Price: ${entry['avg_buy_price_usd']}\n"
-                f"Total Tokens Bought: {entry['total_tokens_bought']}\n"
-                f"Logo: {entry['logo']}\n" for entry in pnl_data
-            ])
-            return f"Wallet PnL for {address_id}:\n{pnl_info}"
+            parts = [f"Wallet PnL for {address_id}:\n", _PNL_HEADER]
+            append = parts.append
+            for entry in pnl_data:
+                append(_PNL_TEMPLATE(*map(_clean, _PNL_FIELDS(entry))))
+            return "".join(parts)
         else:
             return "No PnL data found for the wallet."
 
-    except requests.exceptions.RequestException as e:
+    except MORALIS_ERRORS as e:
         return f"Error fetching wallet PnL: {str(e)}"
 
 
+def _persist_wallet_data(wallet_data: str, existing: str | None) -> None:
+    """Write the exported wallet data atomically, only when it changed."""
+    if wallet_data == existing:
+        return
 
-def initialize_agent():
-    """Initialize the agent with CDP Agentkit."""
-    # Initialize LLM.
-    llm = ChatOpenAI(model="gpt-4o-mini")
-
-    wallet_data = None
-
-    if os.path.exists(wallet_data_file):
-        with open(wallet_data_file) as f:
-            wallet_data = f.read()
-
+    # Write to a sibling temp file and swap it in so a crash mid-write
+    # never leaves a truncated wallet file behind.
+    directory = os.path.dirname(os.path.abspath(wallet_data_file))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".wallet_data.")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(wallet_data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, wallet_data_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+@functools.lru_cache(maxsize=1)
+def _build_agentkit_and_tools(wallet_data: str | None) -> tuple:
+    """Build the CDP Agentkit wrapper and the agent's tools for a wallet.
+
+    Toolkit construction walks the SDKs to enumerate tools, so the result is
+    memoized on the wallet data and reused if the agent is rebuilt.
+    """
     # Configure CDP Agentkit Langchain Extension.
     values = {}
     if wallet_data is not None:
@@ -409,11 +1043,6 @@ def initialize_agent():
 
     agentkit = CdpAgentkitWrapper(**values)
 
-    # persist the agent's CDP MPC Wallet Data.
-    wallet_data = agentkit.export_wallet()
-    with open(wallet_data_file, "w") as f:
-        f.write(wallet_data)
-
     # Initialize CDP Agentkit Toolkit and get tools.
     cdp_toolkit = CdpToolkit.from_cdp_agentkit_wrapper(agentkit)
     tools = cdp_toolkit.get_tools()
@@ -440,26 +1069,41 @@ def initialize_agent():
         func=get_token_metadata,
     )
 
+    # Token Metadata Batch Tool
+    tokenMetadataBatchTool = CdpTool(
+        name="get_token_metadata_batch",
+        description=TOKEN_METADATA_BATCH_PROMPT,
+        cdp_agentkit_wrapper=agentkit,
+        args_schema=TokenMetadataBatchInput,
+        func=get_token_metadata_batch,
+    )
+
     # Get Token Details Tool
     tokenDetailsTool = CdpTool(
         name="get_token_details",
-        description="""
-        This tool fetches detailed information about an ERC-20 token on the Base blockchain, 
-        including key metrics like token name, symbol, price, market cap, security score, 
-        and historical performance indicators using the Moralis API.
-        """,
+        description=TOKEN_DETAILS_PROMPT,
         cdp_agentkit_wrapper=agentkit,
         args_schema=TokenDetailsInput,
         func=get_token_details,
     )
 
+    # Get Token Details Batch Tool
+    tokenDetailsBatchTool = CdpTool(
+        name="get_token_details_batch",
+        description=TOKEN_DETAILS_BATCH_PROMPT,
+        cdp_agentkit_wrapper=agentkit,
+        args_schema=TokenDetailsBatchInput,
+        func=get_token_details_batch,
+    )
+
     # Get Wallet NFTs Tool
     walletNftsTool = CdpTool(
         name="get_wallet_nfts",
         description=
-        """Fetch the raw response of NFTs held by a wallet on the Base blockchain. 
-        This action retrieves NFT information using the Moralis API, automatically 
-        determining the correct network (mainnet or testnet) based on the wallet's network ID.
+        """Summarize the NFTs held by a wallet on the Base blockchain: total count,
+        top collections and a short sample. This action retrieves NFT information using
+        the Moralis API, automatically determining the correct network (mainnet or testnet)
+        based on the wallet's network ID.
         """,
         cdp_agentkit_wrapper=agentkit,
         args_schema=WalletNftsInput,
@@ -484,7 +1128,16 @@ def initialize_agent():
         func=get_trending_tokens,
     )
 
-    # Trending Tokens Tool
+    # Trending Tokens Enriched Tool
+    trendingTokensEnrichedTool = CdpTool(
+        name="get_trending_tokens_enriched",
+        description=TRENDING_TOKENS_ENRICHED_PROMPT,
+        cdp_agentkit_wrapper=agentkit,
+        args_schema=TrendingTokensInput,
+        func=get_trending_tokens_enriched,
+    )
+
+    # Wallet PnL Tool
     walletPnlTool = CdpTool(
         name="get_wallet_pnl",
         description=WALLET_PNL_PROMPT,
@@ -495,10 +1148,36 @@ def initialize_agent():
 
     # Add all tools to the tools list
     tools.extend([
-        deployMultiTokenTool, tokenMetadataTool, tokenPairsTool,
-        tokenDetailsTool, walletNftsTool, trendingTokensTool, walletPnlTool
+        deployMultiTokenTool, tokenMetadataTool, tokenMetadataBatchTool,
+        tokenPairsTool, tokenDetailsTool, tokenDetailsBatchTool,
+        walletNftsTool, trendingTokensTool, trendingTokensEnrichedTool,
+        walletPnlTool
     ])
 
+    return agentkit, tuple(tools)
+
+
+def initialize_agent():
+    """Initialize the agent with CDP Agentkit."""
+    # Initialize LLM.
+    llm = ChatOpenAI(model="gpt-4o-mini")
+
+    wallet_data = None
+
+    if os.path.exists(wallet_data_file):
+        with open(wallet_data_file) as f:
+            wallet_data = f.read()
+
+    agentkit, tools = _build_agentkit_and_tools(wallet_data)
+
+    # Resolve the Moralis chain once from the loaded wallet's network.
+    global CHAIN
+    CHAIN = ("base" if agentkit.wallet.network_id in ("base", "base-mainnet")
+             else "base sepolia")
+
+    # persist the agent's CDP MPC Wallet Data.
+    _persist_wallet_data(agentkit.export_wallet(), wallet_data)
+
     # Store buffered conversation history in memory.
     memory = MemorySaver()
     config = {"configurable": {"thread_id": "CDP Agentkit Chatbot Example!"}}
@@ -506,40 +1185,63 @@ def initialize_agent():
     # Create ReAct Agent using the LLM and CDP Agentkit tools.
     return create_react_agent(
         llm,
-        tools=tools,
+        tools=list(tools),
         checkpointer=memory,
-        state_modifier=
-        "You are a helpful agent that can interact onchain using the Coinbase Developer Platform Agentkit. You are empowered to interact onchain using your tools. If you ever need funds, you can request them from the faucet if you are on network ID `base-sepolia`. If not, you can provide your wallet details and request funds from the user. If someone asks you to do something you can't do with your currently available tools, you must say so, and encourage them to mplement it themselves using the CDP SDK + Agentkit, recommend they go to docs.cdp.coinbase.com for more informaton. Be concise and helpful with your responses. Refrain from restating your tools' descriptions unless it is explicitly requested. You are a specialized investment agent on the Base Layer 2 blockchain, designed to optimize an existing portfolio by analyzing and trading trending tokens.Your primary goal is to identify profitable tokens in the market, review wallet balances, and make calculated swap decisions to enhance the portfolio value.Follow these steps when making investment decisions: 1. Use trending data to identify promising tokens with potential profit.2. For each trending token, retrieve detailed information to evaluate its market cap, liquidity, and security. 3. Check the wallet balance to understand the available assets and decide on a safe percentage to invest. 4. Execute swaps to acquire trending tokens, ensuring the chosen amount aligns with profitability goals and balance management. Make data-driven decisions based on token performance, wallet balance, and profitability, while maximizing portfolio value with each trade. Use all available functions to analyze market trends, asset details, and wallet metrics to act with precision and efficiency"
+        state_modifier=SYSTEM_PROMPT
     ), config
 
 
+# Output
+def _write_chunk(chunk):
+    """Write a streamed agent or tool message, flushing once per message."""
+    # Resolve stdout per message so redirected or captured output is honoured.
+    out = sys.stdout
+    if "agent" in chunk:
+        out.write(str(chunk["agent"]["messages"][0].content))
+        out.write("\n")
+    elif "tools" in chunk:
+        out.write(str(chunk["tools"]["messages"][0].content))
+        out.write("\n")
+    out.write("-------------------\n")
+    out.flush()
+
+
 # Autonomous Mode
-def run_autonomous_mode(agent_executor, config, interval=10):
-    """Run the agent autonomously with specified intervals."""
-    print("Starting autonomous mode...")
+async def _autonomous_loop(agent_executor, config, interval):
+    """Drive the agent, prefetching trending tokens while it idles."""
     while True:
+        # Provide instructions autonomously
+        thought = (
+            "Be creative and do something interesting on the blockchain. "
+            "Choose an action or set of actions and execute it that highlights your abilities."
+        )
+
+        # Run agent in autonomous mode
+        async for chunk in agent_executor.astream(
+            {"messages": [HumanMessage(content=thought)]}, config):
+            _write_chunk(chunk)
+
+        # Warm the trending tokens list while waiting for the next action, so
+        # either trending tool's usual first lookup skips the round-trip.
+        prefetch = asyncio.create_task(
+            asyncio.to_thread(_fetch_trending_tokens))
+        await asyncio.sleep(interval)
         try:
-            # Provide instructions autonomously
-            thought = (
-                "Be creative and do something interesting on the blockchain. "
-                "Choose an action or set of actions and execute it that highlights your abilities."
-            )
-
-            # Run agent in autonomous mode
-            for chunk in agent_executor.stream(
-                {"messages": [HumanMessage(content=thought)]}, config):
-                if "agent" in chunk:
-                    print(chunk["agent"]["messages"][0].content)
-                elif "tools" in chunk:
-                    print(chunk["tools"]["messages"][0].content)
-                print("-------------------")
+            await prefetch
+        except Exception as e:
+            # A failed warm-up must never stop autonomous mode.
+            print(f"Trending tokens prefetch failed: {e!r}")
 
-            # Wait before the next action
-            time.sleep(interval)
 
-        except KeyboardInterrupt:
-            print("Goodbye Agent!")
-            sys.exit(0)
+def run_autonomous_mode(agent_executor, config, interval=10):
+    """Run the agent autonomously with specified intervals."""
+    print("Starting autonomous mode...")
+    try:
+        asyncio.run(_autonomous_loop(agent_executor, config, interval),
+                    loop_factory=LOOP_FACTORY)
+    except KeyboardInterrupt:
+        print("Goodbye Agent!")
+        sys.exit(0)
 
 
 # Chat Mode
@@ -549,17 +1251,14 @@ def run_chat_mode(agent_executor, config):
     while True:
         try:
             user_input = input("\nUser: ")
-            if user_input.lower() == "exit":
+            # Only four-character inputs can be "exit"; skip lowering the rest.
+            if len(user_input) == 4 and user_input.lower() == "exit":
                 break
 
             # Run agent with the user's input in chat mode
             for chunk in agent_executor.stream(
                 {"messages": [HumanMessage(content=user_input)]}, config):
-                if "agent" in chunk:
-                    print(chunk["agent"]["messages"][0].content)
-                elif "tools" in chunk:
-                    print(chunk["tools"]["messages"][0].content)
-                print("-------------------")
+                _write_chunk(chunk)
 
         except KeyboardInterrupt:
             print("Goodbye Agent!")
@@ -567,6 +1266,9 @@ def run_chat_mode(agent_executor, config):
 
 
 # Mode Selection
+_MODES = {"1": "chat", "chat": "chat", "2": "auto", "auto": "auto"}
+
+
 def choose_mode():
     """Choose whether to run in autonomous or chat mode based on user input."""
     while True:
@@ -576,10 +1278,9 @@ def choose_mode():
 
         choice = input(
             "\nChoose a mode (enter number or name): ").lower().strip()
-        if choice in ["1", "chat"]:
-            return "chat"
-        elif choice in ["2", "auto"]:
-            return "auto"
+        mode = _MODES.get(choice)
+        if mode is not None:
+            return mode
         print("Invalid choice. Please try again.")
 
 